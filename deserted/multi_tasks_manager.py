@@ -5,14 +5,20 @@
 # @Email   : tao.xu2008@outlook.com
 
 """
-MultiTasksManager class based on python threading lib is provided for multi-tasks in parallel.
+MultiTasksManager class based on python concurrent.futures thread/process pool is provided for multi-tasks in parallel.
 """
 
-from src.log import Logger
-from threading import Thread
-from queue import Queue
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_EXCEPTION
 
-LOGGER = Logger.get_logger(__name__)
+from tlib import log
+
+LOGGER = log.get_logger()
+
+# Upper bound of worker threads, the tasks are expected to be I/O-bound
+MAX_WORKERS = 32
 
 
 class MultiTasksManagerError(BaseException):
@@ -20,19 +26,36 @@ class MultiTasksManagerError(BaseException):
     pass
 
 
+class _TaskFailure(Exception):
+    """Raised by _run_batch to complete its future at once if one task failed in fail-fast mode."""
+    pass
+
+
 class MultiTasksManager(object):
     """
-    Run multi-tasks in parallel based on Python threading lib.
+    Run multi-tasks in parallel based on a reusable thread pool or process pool.
     The class provides two public methods for external user: register and runMultiTasks. The register method is used for
     registering the tasks that need to run in parallel. The runMultiTasks method will run the registered tasks in
     parallel and be blocked until all tasks are completed and then return the result.
 
+    The pool is created by the first run and kept for the next runs, call close() to shut it down when the manager is
+    not needed anymore, or use the manager as a context manager.
+
+    The thread backend (by default) fits the I/O-bound tasks. For the CPU-bound tasks, use the process backend so the
+    tasks are not serialized by the GIL, the registered functions and arguments must be picklable then.
+
     >> multiTasks = MultiTasksManager()
     >> multiTasks.register(function1, arg1, arg2, kwarg1, kwarg2)
     >> multiTasks.register(function2, arg1, arg2, kwarg1, kwarg2)
     >> multiTasks.register(function3, arg1, arg2, kwarg1, kwarg2)
-    >> result = multiTasks.runMultiTasksManager()
+    >> result = multiTasks.runMultiTasks()
+    >> multiTasks.close()
+
+    >> with MultiTasksManager(backend=MultiTasksManager.BACKEND_PROCESS) as multiTasks:
+    >>     multiTasks.register(function1, arg1, arg2, kwarg1, kwarg2)
+    >>     result = multiTasks.runMultiTasks()
     """
+    __slots__ = ('tasks', 'taskIndex', '_backend', '_mp_context', '_executor', '_max_workers')
 
     # Decide how to check the tasks result
     # All tasks have no return value
@@ -41,19 +64,41 @@ class MultiTasksManager(object):
     TASK_RETURN_VALUES = 1
     # Keep the task order so can return the results according to the registered order
     TASK_INDEX = "taskIndex"
-
-    def __init__(self):
+    # The result of the task which is not completed when runMultiTasks returns early in fail-fast mode
+    TASK_CANCELLED = "task cancelled because another task failed"
+    # Decide how to run the tasks
+    # Run tasks in a thread pool, for I/O-bound tasks
+    BACKEND_THREAD = 'thread'
+    # Run tasks in a process pool, for CPU-bound tasks
+    BACKEND_PROCESS = 'process'
+
+    def __init__(self, backend=BACKEND_THREAD, mp_context=None):
         """
         Init MultiTasksManager
+
+        :param backend: BACKEND_THREAD(by default) or BACKEND_PROCESS
+        :param mp_context: the multiprocessing context for the process backend, the forked child processes may be
+                           unsafe on Windows/macOS, use multiprocessing.get_context('spawn') there
+        :raises MultiTasksManagerError: if the backend is invalid
         """
+        if backend not in (self.__class__.BACKEND_THREAD, self.__class__.BACKEND_PROCESS):
+            errorMsg = "invalid backend: %s" % backend
+            LOGGER.error(errorMsg)
+            raise MultiTasksManagerError(errorMsg)
+        self._backend = backend
+        self._mp_context = mp_context
+        # The pool is created lazily by runMultiTasks and reused later
+        self._executor = None
+        self._max_workers = 0
         self._setup()
 
-    def _run_task(self, *args, **kwargs):
+    def _run_task(self, task_fun, task_args, task_kwargs, results, on_complete=None, **kwargs):
         """
-        Run one task in specific thread.
+        Run one task in a worker thread of the pool.
 
-        Run one task and keep the result of this task in Queue. Each item in Queue includes task index, return code and
-        the task result.
+        Run one task and keep the result of this task in its slot of the results list, that is results[task index - 1].
+        Each slot is a tuple includes return code and the task result. Each slot is written by only one thread, so no
+        lock is needed. Then on_complete is called with the task index and the slot, if given.
 
         The task index is one integer number to indicate the registered task order.
 
@@ -66,74 +111,309 @@ class MultiTasksManager(object):
         :param func task_fun: the function need to be added in the task list and will be run by the thread.
         :param task_args: the positional arguments of function registed.
         :param task_kwargs: the keyword arguments of function registed.
+        :param list results: the pre-sized results list of all tasks
+        :param func on_complete: callable(index, ok, result) called once the task is completed
         :param kwargs: record the task index
-        :raises originException: if the registered function executed failed
-        :return: return value depend on the registered function return result
+        :return: the return code
+        :rtype: bool
 
-        >> taskThread = Thread(target=self._runTask, args=(task_fun, task_args, task_kwargs), kwargs=kwargs)
+        >> self._run_task(task_fun, task_args, task_kwargs, results, taskIndex=1)
         """
-
-        task_fun = args[0]
-        task_args = args[1]
-        task_kwargs = args[2]
-
-        if 'log_level' in task_kwargs.keys():
-            log_level = task_kwargs['log_level']
-        else:
-            log_level = 'error'
-
         task_index = kwargs[self.__class__.TASK_INDEX]
         LOGGER.debug("Run task %s (index=%d): args=%s, kwargs=%s", task_fun.__name__, task_index, task_args, task_kwargs)
         try:
             result = task_fun(*task_args, **task_kwargs)
             LOGGER.debug("result=%s (index=%d)", result, task_index)
-            self.taskResults.put((task_index, True, result))
+            results[task_index - 1] = (True, result)
             LOGGER.debug("Success for task %s: args=%s, kwargs=%s", task_fun.__name__, task_args, task_kwargs)
         except BaseException as originException:
-            self.taskResults.put((task_index, False, str(originException)))
-            if log_level.lower() == 'error':
-                LOGGER.exception("Failure for task %s: args=%s, kwargs=%s", task_fun.__name__, task_args, task_kwargs)
-            else:
-                LOGGER.debug("Failure for task %s: args=%s, kwargs=%s", task_fun.__name__, task_args, task_kwargs)
-            raise originException
+            results[task_index - 1] = (False, str(originException))
+            self._log_task_failure(task_fun, task_args, task_kwargs, originException)
+        rc, result = results[task_index - 1]
+        self._notify_complete(on_complete, task_index, rc, result)
+        return rc
+
+    def _log_task_failure(self, task_fun, task_args, task_kwargs, error):
+        """
+        Log the task failure at the log_level of the task, error by default, the same for both backends.
+
+        :param func task_fun: the registered function
+        :param task_args: the positional arguments of function registed.
+        :param task_kwargs: the keyword arguments of function registed.
+        :param BaseException error: the exception raised in the task
+        """
+        log_level = task_kwargs.get('log_level', 'error')
+        if str(log_level).lower() == 'error':
+            LOGGER.error("Failure for task %s: args=%s, kwargs=%s", task_fun.__name__, task_args, task_kwargs,
+                         exc_info=error)
+        else:
+            LOGGER.debug("Failure for task %s: args=%s, kwargs=%s", task_fun.__name__, task_args, task_kwargs)
+
+    def _notify_complete(self, on_complete, task_index, rc, result):
+        """
+        Call the on_complete hook of one task, the exception raised in the hook is logged and ignored, except
+        KeyboardInterrupt and SystemExit.
+
+        :param func on_complete: callable(index, ok, result), or None
+        :param int task_index: the task index
+        :param bool rc: the return code
+        :param result: the task result or exception message
+        """
+        if on_complete is None:
+            return
+        try:
+            on_complete(task_index, rc, result)
+        except Exception:
+            LOGGER.exception("Failure for on_complete hook of task (index=%d)", task_index)
 
     def register(self, task_fun, *task_args, **task_kwargs):
         """
-        Register the tasks to be run in parallel and return the thread name
+        Register the tasks to be run in parallel and return the task index
 
         :param func task_fun: the function to be run in multi-tasks in parallel.
         :param task_args: the positional arguments of function registed.
         :param task_kwargs: the keyword arguments of function registed.
-        :return: the thread name
-        :rtype: String
+        :return: the task index
+        :rtype: int
 
         >> multiTasks = self.surepayManager.multiTasksManager
-        >> thread_name = multiTasks.register(function1, arg1)
+        >> task_index = multiTasks.register(function1, arg1)
         >> multiTasks.register(function2, arg1, arg2)
         """
-        # Record the task index
-        kwargs = {self.__class__.TASK_INDEX: self.taskIndex}
-        # Add this task to task list
-        task_thread = Thread(target=self._run_task, args=(task_fun, task_args, task_kwargs), kwargs=kwargs)
-        self.tasks.append(task_thread)
-        thread_name = task_thread.getName()
-        debug_msg = "Register task: task - %s, index - %d, thread name - %s, args - %s, kwargs - %s" \
-                   % (task_fun.__name__, self.taskIndex, thread_name, task_args, task_kwargs)
-        LOGGER.trace(debug_msg)
+        task_index = self.taskIndex
+        # Add this task to task list, it will be submitted to the pool by runMultiTasks
+        self.tasks.append((task_fun, task_args, task_kwargs, task_index))
+        debug_msg = "Register task: task - %s, index - %d, args - %s, kwargs - %s" \
+                    % (task_fun.__name__, task_index, task_args, task_kwargs)
+        LOGGER.debug(debug_msg)
         self.taskIndex += 1
-        return thread_name
+        return task_index
+
+    def register_batch(self, task_specs):
+        """
+        Register a batch of tasks to be run in parallel and return the task indexes
+
+        :param task_specs: an iterable of (task_fun, task_args, task_kwargs), task_args is a tuple and task_kwargs is a
+                           dict.
+        :return: the task indexes
+        :rtype: list
+
+        >> multiTasks.register_batch([(function1, (arg1,), {}), (function2, (arg1, arg2), {'kwarg1': kwarg1})])
+        """
+        return [self.register(task_fun, *task_args, **task_kwargs) for task_fun, task_args, task_kwargs in task_specs]
+
+    def _get_executor(self, task_num):
+        """
+        Get the pool, create it lazily, grow it if it's too small for task_num tasks, or replace it if it's broken.
+
+        The pool is kept between runMultiTasks calls so the workers are reused. The replaced pool is shut down without
+        waiting, its running tasks (e.g. left by fail-fast mode) complete in background.
+
+        A process pool is broken once one of its processes terminated abruptly (e.g. os._exit in a task), it rejects
+        all new tasks then, so it's not reused.
+
+        :param int task_num: the number of tasks to be submitted
+        :return: the thread pool or process pool based on the backend
+        :rtype: ThreadPoolExecutor or ProcessPoolExecutor
+        """
+        if self._backend == self.__class__.BACKEND_PROCESS:
+            max_workers = min(os.cpu_count() or 1, task_num or 1)
+        else:
+            max_workers = min(MAX_WORKERS, task_num or 1)
+        # concurrent.futures has no public API for the broken state, the pools keep it in _broken
+        broken = self._executor is not None and getattr(self._executor, '_broken', False)
+        if self._executor is None or broken or self._max_workers < max_workers:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            if self._backend == self.__class__.BACKEND_PROCESS:
+                self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=self._mp_context)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=max_workers)
+            self._max_workers = max_workers
+        return self._executor
+
+    def _run_batch(self, batch, results, stop=None, on_complete=None):
+        """
+        Run a batch of tasks one by one in the same worker thread.
+
+        In fail-fast mode, the stop event is given. The batch is stopped once any task failed, in this batch or not.
+
+        :param list batch: the registered tasks, (task_fun, task_args, task_kwargs, task index)
+        :param list results: the pre-sized results list of all tasks
+        :param threading.Event stop: set if any task failed, only for fail-fast mode
+        :param func on_complete: callable(index, ok, result) called once each task is completed
+        :raises _TaskFailure: if one task in this batch failed in fail-fast mode
+        """
+        for task_fun, task_args, task_kwargs, index in batch:
+            if stop is not None and stop.is_set():
+                return
+            rc = self._run_task(task_fun, task_args, task_kwargs, results, on_complete,
+                                **{self.__class__.TASK_INDEX: index})
+            if not rc and stop is not None:
+                stop.set()
+                raise _TaskFailure(index)
+
+    def _submit_tasks(self, executor, tasks, results, batch_size=None, stop=None, on_complete=None):
+        """
+        Submit the tasks to the pool.
+
+        For the thread backend, each task is submitted alone by default, so the pool schedules the tasks dynamically
+        and the slow tasks don't delay the others. If batch_size is given, the tasks are partitioned into batches and
+        one batch is submitted once, so the scheduling overhead is shared by the tasks in a batch, that fits many tiny
+        tasks. The tasks in a batch run one by one in the same worker.
+
+        For the process backend, the registered function is submitted directly because _run_task is bound to this
+        object which can't be pickled. Its result is written into the results list by _set_process_result when
+        waiting the tasks.
+
+        :param executor: the pool
+        :param list tasks: the registered tasks
+        :param list results: the pre-sized results list of all tasks
+        :param int batch_size: the number of tasks in one batch, only for the thread backend, 1 by default
+        :param threading.Event stop: the stop event for fail-fast mode, only for the thread backend
+        :param func on_complete: callable(index, ok, result) called by the worker threads, only for the thread backend
+        :return: (future, batch of tasks) of each submission, a batch has only one task for the process backend
+        :rtype: list
+        """
+        if self._backend == self.__class__.BACKEND_PROCESS:
+            return [(executor.submit(task[0], *task[1], **task[2]), [task]) for task in tasks]
+        batch_size = batch_size or 1
+        batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+        return [(executor.submit(self._run_batch, batch, results, stop, on_complete), batch) for batch in batches]
+
+    def _set_process_result(self, results, task, future):
+        """
+        Write the task result of the process backend into its slot, and log the failure like _run_task.
+
+        :param list results: the pre-sized results list of all tasks
+        :param tuple task: the registered task, (task_fun, task_args, task_kwargs, task index)
+        :param future: the done future of this task
+        """
+        task_fun, task_args, task_kwargs, task_index = task
+        try:
+            results[task_index - 1] = (True, future.result())
+            LOGGER.debug("Success for task %s: args=%s, kwargs=%s", task_fun.__name__, task_args, task_kwargs)
+        except BaseException as originException:
+            results[task_index - 1] = (False, str(originException))
+            self._log_task_failure(task_fun, task_args, task_kwargs, originException)
+
+    def _check_batch_errors(self, submitted, results):
+        """
+        Keep the exception raised out of _run_task in the empty result slots of its batch, for the thread backend.
+
+        :param list submitted: (future, batch of tasks) returned by _submit_tasks
+        :param list results: the pre-sized results list of all tasks
+        :return: True if any batch raised such exception
+        :rtype: bool
+        """
+        failed = False
+        for future, batch in submitted:
+            if not future.done() or future.cancelled():
+                continue
+            error = future.exception()
+            if error is None or isinstance(error, _TaskFailure):
+                continue
+            LOGGER.error("Failure for tasks (index=%d-%d): %s", batch[0][3], batch[-1][3], error)
+            failed = True
+            for _, _, _, index in batch:
+                if results[index - 1] is None:
+                    results[index - 1] = (False, str(error))
+        return failed
+
+    def _wait_tasks(self, submitted, results, stop=None, on_complete=None):
+        """
+        Wait all tasks complete, or until any task failed in fail-fast mode.
+
+        For the process backend, the task results are written into the results list here once each task is done, and
+        on_complete is called here as well.
+
+        In fail-fast mode, the futures not started yet are cancelled once any task failed, the running ones are not
+        waited.
+
+        :param list submitted: (future, batch of tasks) returned by _submit_tasks
+        :param list results: the pre-sized results list of all tasks
+        :param threading.Event stop: the stop event for fail-fast mode, None to wait all tasks
+        :param func on_complete: callable(index, ok, result), only for the process backend
+        :return: True if stopped early for a task failure in fail-fast mode
+        :rtype: bool
+        """
+        futures = [future for future, _ in submitted]
+        if self._backend != self.__class__.BACKEND_PROCESS:
+            if stop is None:
+                wait(futures)
+            else:
+                wait(futures, return_when=FIRST_EXCEPTION)
+            if self._check_batch_errors(submitted, results) and stop is not None:
+                stop.set()
+        else:
+            task_of_future = dict((future, batch[0]) for future, batch in submitted)
+            for future in as_completed(futures):
+                task = task_of_future[future]
+                index = task[3]
+                self._set_process_result(results, task, future)
+                self._notify_complete(on_complete, index, *results[index - 1])
+                if stop is not None and not results[index - 1][0]:
+                    stop.set()
+                    break
+        if stop is None or not stop.is_set():
+            return False
+        for future in futures:
+            future.cancel()
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Shutdown the pool, wait the running tasks complete
+
+        The pool will be created again if runMultiTasks is called later.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._max_workers = 0
 
     def _setup(self):
         """Clean share information
         """
-        # Record the each task result into thread-safety Queue
-        self.taskResults = Queue()
         # Keep tasks in list
         self.tasks = list()
         # Keep the registered task order so return the task result according to this order
         self.taskIndex = 1
 
-    def _checkTaskResult(self, taskType):
+    def _check_task_type(self, taskType):
+        """
+        Check the task type, TASK_NO_RETURN by default
+
+        :param constant taskType: task type(TASK_NO_RETURN or TASK_RETURN_VALUES)
+        :return: the task type
+        :raises MultiTasksManagerError: if the task type is invalid
+        """
+        if taskType is None:
+            taskType = self.__class__.TASK_NO_RETURN
+        if taskType not in (self.__class__.TASK_NO_RETURN, self.__class__.TASK_RETURN_VALUES):
+            errorMsg = "invalid taskType: %s" % taskType
+            LOGGER.error(errorMsg)
+            raise MultiTasksManagerError(errorMsg)
+        return taskType
+
+    def _check_batch_size(self, batch_size):
+        """
+        Check the batch size, None means one task for each submission
+
+        :param int batch_size: the number of tasks in one batch
+        :raises MultiTasksManagerError: if the batch size is not a positive integer
+        """
+        if batch_size is not None and (not isinstance(batch_size, int) or batch_size < 1):
+            errorMsg = "invalid batch_size: %s" % batch_size
+            LOGGER.error(errorMsg)
+            raise MultiTasksManagerError(errorMsg)
+
+    def _checkTaskResult(self, taskType, results):
         """
         Check task result based on task type
 
@@ -145,26 +425,21 @@ class MultiTasksManager(object):
         of the first registered task and the like.
 
         :param constant taskType: task type(TASK_NO_RETURN or TASK_RETURN_VALUES)
+        :param list results: (return code, task result) of each task, in the registered order
 
-        >> result = self._checkTaskResult(self.__class__.TASK_NO_RETURN)
+        >> result = self._checkTaskResult(self.__class__.TASK_NO_RETURN, results)
         :return: a boolean(True/False) based on above input parameter TASK_NO_RETURN
-        >> result = self._checkTaskResult(self.__class__.TASK_RETURN_VALUES)
+        >> result = self._checkTaskResult(self.__class__.TASK_RETURN_VALUES, results)
         :return: a list of the task executing result
         """
-        returnCodes = list()
-        results = dict()
-        while not self.taskResults.empty():
-            index, rc, result = self.taskResults.get()
-            returnCodes.append(rc)
-            results[index] = (rc, result)
         # Only need to check whether all tasks are successful or not
         if taskType == self.__class__.TASK_NO_RETURN:
-            return all(returnCodes)
+            return all(rc for rc, _ in results)
         else:
             # return the task result according to the registered order
-            return [results[key] for key in sorted(results.keys())]
+            return results
 
-    def runMultiTasks(self, taskType=None):
+    def runMultiTasks(self, taskType=None, batch_size=None, fail_fast=False, on_complete=None):
         """
         Run registed tasks in parallel and return a bool value or list based on task type.
 
@@ -182,7 +457,19 @@ class MultiTasksManager(object):
         If the function is executed successfuly, each item of the result list will be like (True, function result)
         If exception is raised in any tasks, the corresponding result will like (False, function exception string).
 
+        If fail_fast is True, this method returns once any task failed, without waiting the other tasks. The tasks not
+        completed then are cancelled if not started yet, their results will be (False, TASK_CANCELLED). The tasks
+        already running keep running in background, and still call on_complete when they are completed, even after
+        this method returned.
+
+        If on_complete is given, it's called as on_complete(index, ok, result) once each task is completed, so the
+        results can be handled while the other tasks are running. It's called in the worker threads for the thread
+        backend, so it must be thread-safe, and in the calling thread for the process backend.
+
         :param constant taskType: registered task type (TASK_NO_RETURN or TASK_RETURN_VALUES)
+        :param int batch_size: the number of tasks submitted to the pool at once, see _submit_tasks
+        :param bool fail_fast: return at the first task failure
+        :param func on_complete: callable(index, ok, result) called once each task is completed
         :return: <list here the two possible return value/type, see exmaple below>
                  a boolean based on above usage, no parameter of runMultiTasks()
                  a list with the result of current function, there's a parameter of runMultiTasks()
@@ -197,20 +484,86 @@ class MultiTasksManager(object):
         >> multiTasks.register(function4, arg1, arg2, kwarg1, kwarg2)
         >> resultList = multiTasks.runMultiTasks(MultiTasksManager.TASK_RETURN_VALUES)
         """
-        if taskType is None:
-            taskType = self.__class__.TASK_NO_RETURN
-        if taskType not in (self.__class__.TASK_NO_RETURN, self.__class__.TASK_RETURN_VALUES):
-            errorMsg = "%s - %s" % (msgs.TASK_TYPE_FAILURE, taskType)
-            LOGGER.error(errorMsg)
-            raise MultiTasksManagerError, errorMsg
-        # Start all registered tasks
-        for task in self.tasks:
-            task.start()
+        taskType = self._check_task_type(taskType)
+        self._check_batch_size(batch_size)
+        tasks = self.tasks
+        executor = self._get_executor(len(tasks))
+        # Take the registered tasks away once the pool is usable, and clean the share information before next multiple
+        # tasks.
+        self._setup()
+        # One result slot for each task, in the registered order
+        results = [None] * len(tasks)
+        stop = threading.Event() if fail_fast else None
+        # Submit all registered tasks
+        submitted = self._submit_tasks(executor, tasks, results, batch_size, stop, on_complete)
         # Wait all tasks complete
-        for task in self.tasks:
-            task.join()
+        if self._wait_tasks(submitted, results, stop, on_complete):
+            # Stopped early, the running tasks may still write the results list, so return a copy
+            cancelled = (False, self.__class__.TASK_CANCELLED)
+            results = [cancelled if result is None else result for result in results]
         # Check the task results based on task type
-        result = self._checkTaskResult(taskType)
-        # Clean the share information before next multiple tasks.
+        return self._checkTaskResult(taskType, results)
+
+    async def run_multi_tasks_async(self, taskType=None, batch_size=None, on_complete=None):
+        """
+        Run registed tasks in parallel without blocking the running asyncio event loop.
+
+        The tasks are still run in the pool, the coroutine is suspended until all tasks are completed. The exception
+        raised in any task is kept in its result and doesn't cancel the others. The argument taskType and the return
+        value are the same as runMultiTasks.
+
+        Nothing blocks the loop before the tasks are awaited: if the pool is grown for more tasks, the replaced pool is
+        not waited, see _get_executor.
+
+        Unlike runMultiTasks, on_complete is always called in the event loop thread, for both backends, so it can use
+        the loop directly (e.g. asyncio.Queue.put_nowait) but must not block. All calls are done before this
+        coroutine returns.
+
+        :param constant taskType: registered task type (TASK_NO_RETURN or TASK_RETURN_VALUES)
+        :param int batch_size: the number of tasks submitted to the pool at once, see _submit_tasks
+        :param func on_complete: callable(index, ok, result) called in the event loop once each task is completed
+        :return: a boolean or a list of the task executing result, see runMultiTasks
+
+        >> multiTasks.register(function1, arg1, arg2, kwarg1, kwarg2)
+        >> resultList = await multiTasks.run_multi_tasks_async(MultiTasksManager.TASK_RETURN_VALUES)
+        """
+        taskType = self._check_task_type(taskType)
+        self._check_batch_size(batch_size)
+        tasks = self.tasks
+        executor = self._get_executor(len(tasks))
+        # Take the registered tasks away once the pool is usable, so new tasks can be registered while waiting
         self._setup()
-        return result
\ No newline at end of file
+        results = [None] * len(tasks)
+        worker_hook = None
+        if on_complete is not None and self._backend != self.__class__.BACKEND_PROCESS:
+            loop = asyncio.get_running_loop()
+
+            def worker_hook(index, ok, result):
+                # Called in the worker thread, hand the hook over to the event loop. It runs before the future of this
+                # batch is handled by the loop, since both are scheduled by call_soon_threadsafe in this order.
+                loop.call_soon_threadsafe(self._notify_complete, on_complete, index, ok, result)
+
+        submitted = self._submit_tasks(executor, tasks, results, batch_size, on_complete=worker_hook)
+        if self._backend == self.__class__.BACKEND_PROCESS:
+            # Handle each task result once it's done, not after all tasks
+            await asyncio.gather(*[self._await_process_task(future, batch[0], results, on_complete)
+                                   for future, batch in submitted])
+        else:
+            # Await all tasks complete, the task exception has been kept in its result slot
+            await asyncio.gather(*[asyncio.wrap_future(future) for future, _ in submitted], return_exceptions=True)
+            self._check_batch_errors(submitted, results)
+        return self._checkTaskResult(taskType, results)
+
+    async def _await_process_task(self, future, task, results, on_complete=None):
+        """
+        Await one task of the process backend, then write its result and call on_complete in the event loop.
+
+        :param future: the future of this task
+        :param tuple task: the registered task, (task_fun, task_args, task_kwargs, task index)
+        :param list results: the pre-sized results list of all tasks
+        :param func on_complete: callable(index, ok, result) called once this task is completed
+        """
+        index = task[3]
+        await asyncio.gather(asyncio.wrap_future(future), return_exceptions=True)
+        self._set_process_result(results, task, future)
+        self._notify_complete(on_complete, index, *results[index - 1])
\ No newline at end of file
@@ -1,3 +1,3 @@
 __all__ = [
-    'argument', 'test_log', 'test_mail'
+    'argument', 'test_log', 'test_mail', 'test_multi_tasks_manager', 'test_lock_file'
 ]
\ No newline at end of file
@@ -0,0 +1,89 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Time    : 2019/8/8 12:49
+# @Author  : Tao.Xu
+# @Email   : tao.xu2008@outlook.com
+
+"""
+Test suite: TestCases for tlib/fileop/lock_file.py
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+from tlib.stressrunner import StressRunner
+from tlib.exceptions import LockFileError
+from tlib.fileop.lock_file import LockFile, FILELOCK_SHARED
+
+
+class TestLockFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        self.fpath = os.path.join(self.tmp_dir, 'test.lock')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def test_1(self):
+        """invalid lock type is rejected by the constructor"""
+        self.assertRaises(LockFileError, LockFile, self.fpath, 0)
+
+    def test_2(self):
+        """non-blocking lock fails while the exclusive lock is held"""
+        holder = LockFile(self.fpath)
+        holder.lock()
+        other = LockFile(self.fpath)
+        self.assertRaises(LockFileError, other.lock, blocking=False)
+        holder.unlock()
+        other.lock(blocking=False)
+        other.unlock()
+
+    def test_3(self):
+        """shared locks don't block each other"""
+        first = LockFile(self.fpath, FILELOCK_SHARED)
+        second = LockFile(self.fpath, FILELOCK_SHARED)
+        first.lock(blocking=False)
+        second.lock(blocking=False)
+        first.unlock()
+        second.unlock()
+
+    def test_4(self):
+        """the with statement holds the lock, then unlocks and closes the file"""
+        with LockFile(self.fpath) as lock_file:
+            other = LockFile(self.fpath)
+            self.assertRaises(LockFileError, other.lock, blocking=False)
+        self.assertIsNone(lock_file._fhandle)
+        other.lock(blocking=False)
+        other.close()
+
+    def test_5(self):
+        """blocking lock waits with backoff until the lock is released"""
+        holder = LockFile(self.fpath)
+        holder.lock()
+        timer = threading.Timer(0.3, holder.unlock)
+        timer.start()
+        start = time.time()
+        with LockFile(self.fpath):
+            elapsed = time.time() - start
+        timer.join()
+        holder.close()
+        self.assertGreaterEqual(elapsed, 0.3)
+        # the backoff is capped at LockFile._BACKOFF_MAX
+        self.assertLess(elapsed, 0.3 + LockFile._BACKOFF_MAX + 0.2)
+
+
+if __name__ == '__main__':
+    # Generate test suite
+    test_suite = unittest.TestSuite()
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLockFile))
+
+    runner = StressRunner(
+        report_path='./report/',
+        title='My unit test',
+        description='This demonstrates the report output by StressRunner.',
+    )
+    runner.run(test_suite)
@@ -0,0 +1,248 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# @Time    : 2019/8/8 12:49
+# @Author  : Tao.Xu
+# @Email   : tao.xu2008@outlook.com
+
+"""
+Test suite: TestCases for deserted/multi_tasks_manager.py
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import unittest
+
+from tlib.stressrunner import StressRunner
+from deserted.multi_tasks_manager import LOGGER, MultiTasksManager, MultiTasksManagerError
+
+
+def sleep_return(seconds, log_level='error'):
+    time.sleep(seconds)
+    return seconds
+
+
+def raise_error(msg, log_level='debug'):
+    raise ValueError(msg)
+
+
+def exit_process():
+    os._exit(1)
+
+
+class TestMultiTasksManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.manager = MultiTasksManager()
+
+    def tearDown(self) -> None:
+        self.manager.close()
+
+    def test_1(self):
+        """process backend"""
+        self.assertRaises(MultiTasksManagerError, MultiTasksManager, backend='unknown')
+        with MultiTasksManager(backend=MultiTasksManager.BACKEND_PROCESS) as manager:
+            manager.register(sleep_return, 0)
+            manager.register(raise_error, 'failed')
+            self.assertEqual(manager.runMultiTasks(MultiTasksManager.TASK_RETURN_VALUES),
+                             [(True, 0), (False, 'failed')])
+        self.assertIsNone(manager._executor)
+
+    def test_2(self):
+        """async run returns the same results and doesn't block the event loop"""
+        self.manager.register(sleep_return, 0.2)
+        self.manager.register(raise_error, 'failed')
+
+        async def run():
+            ticks = list()
+
+            async def tick():
+                for _ in range(5):
+                    ticks.append(time.time())
+                    await asyncio.sleep(0.01)
+
+            results, _ = await asyncio.gather(
+                self.manager.run_multi_tasks_async(MultiTasksManager.TASK_RETURN_VALUES), tick())
+            return results, ticks
+
+        results, ticks = asyncio.run(run())
+        self.assertEqual(results, [(True, 0.2), (False, 'failed')])
+        self.assertEqual(len(ticks), 5)
+        self.assertLess(ticks[-1] - ticks[0], 0.15)
+
+    def test_3(self):
+        """results keep the registered order, with or without batches"""
+        for batch_size in (None, 1, 3):
+            for i in range(10):
+                self.manager.register(sleep_return, 0.01 * (10 - i))
+            self.manager.register(raise_error, 'failed')
+            results = self.manager.runMultiTasks(MultiTasksManager.TASK_RETURN_VALUES, batch_size=batch_size)
+            self.assertEqual(results[:-1], [(True, 0.01 * (10 - i)) for i in range(10)])
+            self.assertEqual(results[-1], (False, 'failed'))
+            self.assertEqual(self.manager.tasks, [])
+
+    def test_4(self):
+        """invalid task type"""
+        self.assertRaises(MultiTasksManagerError, self.manager.runMultiTasks, 'unknown')
+
+    def test_5(self):
+        """fail-fast returns at the first failure"""
+        self.manager.register(sleep_return, 1)
+        self.manager.register(raise_error, 'failed')
+        start = time.time()
+        results = self.manager.runMultiTasks(MultiTasksManager.TASK_RETURN_VALUES, batch_size=1, fail_fast=True)
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(results, [(False, MultiTasksManager.TASK_CANCELLED), (False, 'failed')])
+
+    def test_6(self):
+        """on_complete is called once for each task"""
+        completed = list()
+        self.manager.register(sleep_return, 0.1)
+        self.manager.register(sleep_return, 0)
+        self.manager.register(raise_error, 'failed')
+        self.manager.runMultiTasks(on_complete=lambda *args: completed.append(args), batch_size=1)
+        self.assertEqual(sorted(completed), [(1, True, 0.1), (2, True, 0), (3, False, 'failed')])
+        self.assertEqual(completed[-1], (1, True, 0.1))
+
+    def test_7(self):
+        """log_level of any type doesn't break the task"""
+        for log_level in (None, logging.DEBUG, 'DEBUG', 'error'):
+            self.manager.register(sleep_return, 0, log_level=log_level)
+            self.manager.register(raise_error, 'failed', log_level=log_level)
+            results = self.manager.runMultiTasks(MultiTasksManager.TASK_RETURN_VALUES)
+            self.assertEqual(results, [(True, 0), (False, 'failed')])
+
+    def test_8(self):
+        """tasks left running by fail-fast don't delay the next run, whether the pool is grown or not"""
+        self.manager.register(sleep_return, 1)
+        self.manager.register(raise_error, 'failed')
+        self.manager.runMultiTasks(batch_size=1, fail_fast=True)
+        # 2 tasks fit in the pool, 40 tasks grow it
+        for task_num in (2, 40):
+            for _ in range(task_num):
+                self.manager.register(sleep_return, 0.01)
+            start = time.time()
+            self.assertTrue(self.manager.runMultiTasks())
+            self.assertLess(time.time() - start, 0.5)
+
+    def test_9(self):
+        """async run doesn't wait the replaced pool when growing it"""
+        self.manager.register(sleep_return, 1)
+        self.manager.register(raise_error, 'failed')
+        self.manager.runMultiTasks(batch_size=1, fail_fast=True)
+        for _ in range(5):
+            self.manager.register(sleep_return, 0)
+
+        async def run():
+            start = time.time()
+            await self.manager.run_multi_tasks_async()
+            return time.time() - start
+
+        self.assertLess(asyncio.run(run()), 0.5)
+
+    def test_10(self):
+        """async run of the process backend calls on_complete once each task is completed"""
+        completed = list()
+        with MultiTasksManager(backend=MultiTasksManager.BACKEND_PROCESS) as manager:
+            manager.register(sleep_return, 0)
+            manager.register(raise_error, 'failed')
+            manager.register(sleep_return, 0.5)
+
+            async def run():
+                start = time.time()
+                results = await manager.run_multi_tasks_async(
+                    MultiTasksManager.TASK_RETURN_VALUES,
+                    on_complete=lambda index, ok, result: completed.append((index, time.time() - start)))
+                return results
+
+            results = asyncio.run(run())
+        self.assertEqual(results, [(True, 0), (False, 'failed'), (True, 0.5)])
+        elapsed = dict(completed)
+        self.assertEqual(sorted(elapsed), [1, 2, 3])
+        # the fast tasks are handled without waiting the slow one
+        self.assertLess(elapsed[1], 0.4)
+        self.assertLess(elapsed[2], 0.4)
+        self.assertGreaterEqual(elapsed[3], 0.5)
+
+    def test_11(self):
+        """invalid batch size"""
+        self.manager.register(sleep_return, 0)
+        for batch_size in (0, -1, 1.5):
+            self.assertRaises(MultiTasksManagerError, self.manager.runMultiTasks, batch_size=batch_size)
+            self.assertRaises(MultiTasksManagerError, asyncio.run,
+                              self.manager.run_multi_tasks_async(batch_size=batch_size))
+        # the registered tasks are kept
+        self.assertTrue(self.manager.runMultiTasks())
+
+    def test_12(self):
+        """a broken process pool is replaced by the next run"""
+        with MultiTasksManager(backend=MultiTasksManager.BACKEND_PROCESS) as manager:
+            manager.register(exit_process)
+            results = manager.runMultiTasks(MultiTasksManager.TASK_RETURN_VALUES)
+            self.assertFalse(results[0][0])
+            for _ in range(2):
+                manager.register(sleep_return, 0)
+                self.assertEqual(manager.runMultiTasks(MultiTasksManager.TASK_RETURN_VALUES), [(True, 0)])
+
+    def test_13(self):
+        """the task failure is logged at the task log_level by both backends"""
+        for backend in (MultiTasksManager.BACKEND_THREAD, MultiTasksManager.BACKEND_PROCESS):
+            with MultiTasksManager(backend=backend) as manager:
+                for log_level, error_logged in (('error', True), ('debug', False)):
+                    manager.register(raise_error, 'failed', log_level=log_level)
+                    with self.assertLogs(LOGGER, logging.DEBUG) as logs:
+                        self.assertFalse(manager.runMultiTasks())
+                    self.assertEqual(any(record.levelno == logging.ERROR for record in logs.records), error_logged)
+
+    def test_14(self):
+        """slow tasks don't delay each other by default"""
+        for i in range(64):
+            self.manager.register(sleep_return, 0.3 if i < 2 else 0)
+        start = time.time()
+        self.assertTrue(self.manager.runMultiTasks())
+        self.assertLess(time.time() - start, 0.5)
+
+
+    def test_15(self):
+        """async run calls on_complete in the event loop for both backends"""
+        for backend in (MultiTasksManager.BACKEND_THREAD, MultiTasksManager.BACKEND_PROCESS):
+            with MultiTasksManager(backend=backend) as manager:
+                for i in range(3):
+                    manager.register(sleep_return, 0.01 * i)
+                manager.register(raise_error, 'failed')
+
+                async def run():
+                    queue = asyncio.Queue()
+
+                    def on_complete(index, ok, result):
+                        queue.put_nowait((index, ok, threading.get_ident()))
+
+                    self.assertFalse(await manager.run_multi_tasks_async(on_complete=on_complete))
+                    return [queue.get_nowait() for _ in range(queue.qsize())]
+
+                completed = asyncio.run(run())
+            self.assertEqual(sorted(completed), [(1, True, threading.get_ident()), (2, True, threading.get_ident()),
+                                                 (3, True, threading.get_ident()), (4, False, threading.get_ident())])
+
+    def test_16(self):
+        """KeyboardInterrupt raised in on_complete is not swallowed"""
+        def on_complete(index, ok, result):
+            raise KeyboardInterrupt()
+
+        with MultiTasksManager(backend=MultiTasksManager.BACKEND_PROCESS) as manager:
+            manager.register(sleep_return, 0)
+            self.assertRaises(KeyboardInterrupt, manager.runMultiTasks, on_complete=on_complete)
+
+
+if __name__ == '__main__':
+    # Generate test suite
+    test_suite = unittest.TestSuite()
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestMultiTasksManager))
+
+    runner = StressRunner(
+        report_path='./report/',
+        title='My unit test',
+        description='This demonstrates the report output by StressRunner.',
+    )
+    runner.run(test_suite)
@@ -10,6 +10,7 @@
 """
 import os
 import sys
+import time
 import fcntl
 
 from tlib import exceptions as err
@@ -31,7 +32,22 @@ FILELOCK_UNLOCK = fcntl.LOCK_UN
 class LockFile(object):
     """
     lock file class
+
+    Use it as a context manager, which locks the file on enter, then unlocks
+    and closes it on exit:
+    ::
+        with LockFile('/tmp/my.lock'):
+            do_something()
     """
+    __slots__ = ('_fpath', '_locktype', '_fhandle', '_nb_flags')
+    # keep module references, __del__ may run when the module globals are
+    # already cleared at interpreter shutdown
+    _os = os
+    _sys = sys
+    # blocking lock() retries non-blocking flock, sleeping between the tries
+    # from _BACKOFF_MIN, doubled each time, up to _BACKOFF_MAX seconds
+    _BACKOFF_MIN = 0.001
+    _BACKOFF_MAX = 0.1
 
     def __init__(self, fpath, locktype=FILELOCK_EXCLUSIVE):
         """
@@ -46,6 +62,10 @@ class LockFile(object):
         self._fpath = fpath
         self._locktype = locktype
         self._fhandle = None
+        if locktype not in (FILELOCK_SHARED, FILELOCK_EXCLUSIVE):
+            raise err.LockFileError('does not support this lock type')
+        # flags for fcntl.flock, computed once instead of per lock() call
+        self._nb_flags = locktype | FILELOCK_NONBLOCKING
         try:
             # if FILELOCK_EXCLUSIVE == locktype:
             #     self._fhandle = os.open(
@@ -62,16 +82,39 @@ class LockFile(object):
                 'catch unkown error type:{0}'.format(error)
             )
 
+    def __enter__(self):
+        """lock the file"""
+        self.lock()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """unlock and close the file"""
+        try:
+            self.unlock()
+        finally:
+            self.close()
+
+    def close(self):
+        """close the lock file, the lock will be released as well"""
+        if self._fhandle is not None:
+            fhandle, self._fhandle = self._fhandle, None
+            try:
+                os.close(fhandle)
+            except Exception as error:
+                raise err.LockFileError(error)
+
     def __del__(self):
-        """del the instance"""
+        """del the instance, best-effort fallback if close() was not called"""
+        fhandle = getattr(self, '_fhandle', None)
+        if fhandle is None:
+            return
+        self._fhandle = None
         try:
-            if self._fhandle is not None:
-                os.close(self._fhandle)
+            self._os.close(fhandle)
         except Exception as error:
-            sys.stderr.write('failed to close lockfile:{0}, msg:{1}'.format(
+            self._sys.stderr.write('failed to close lockfile:{0}, msg:{1}\n'.format(
                 self._fpath, error)
             )
-            sys.stderr.flush()
 
     @decorators.needposix
     def lock(self, blocking=True):
@@ -80,7 +123,8 @@ class LockFile(object):
 
         :param blocking:
             If blocking is True, will block there until tlib gets the lock.
-            True by default.
+            True by default. The waiting is done by retrying a non-blocking
+            lock with exponential backoff, so it keeps interruptible.
 
         :return:
             return False if locking fails
@@ -89,23 +133,19 @@ class LockFile(object):
             raise tlib.err.LockFileError if blocking is False and
             the lock action failed
         """
-        flags = 0x1
-        if FILELOCK_SHARED == self._locktype:
-            flags = FILELOCK_SHARED
-        elif FILELOCK_EXCLUSIVE == self._locktype:
-            flags = FILELOCK_EXCLUSIVE
-        else:
-            raise err.LockFileError('does not support this lock type')
-        if not blocking:
-            flags |= FILELOCK_NONBLOCKING
-        ret = None
-        try:
-            ret = fcntl.flock(self._fhandle, flags)
-        except IOError as error:
-            raise err.LockFileError(error)
-        except Exception as error:
-            raise err.LockFileError(error)
-        return ret
+        backoff = self._BACKOFF_MIN
+        while True:
+            try:
+                return fcntl.flock(self._fhandle, self._nb_flags)
+            except BlockingIOError as error:
+                if not blocking:
+                    raise err.LockFileError(error)
+            except IOError as error:
+                raise err.LockFileError(error)
+            except Exception as error:
+                raise err.LockFileError(error)
+            time.sleep(backoff)
+            backoff = min(backoff * 2, self._BACKOFF_MAX)
 
     def unlock(self):
         """unlock the locked file"""
@@ -49,6 +49,7 @@ from tlib.jenkinslib import internal
 from tlib.jenkinslib.internal import exception as _exception
 from tlib.jenkinslib.internal import jenkins as _jenkins
 from tlib.jenkinslib.internal import promotion as _promotion
+from tlib.jenkinslib.internal import requester as _requester
 
 # import Jenkins and Promotion
 Jenkins = _jenkins.Jenkins
@@ -177,13 +178,17 @@ def current_build(username=None, password=None):
     return current_job(username=username, password=password)[int(build_number)]
 
 
-def is_accessible(url, username, password):
+def is_accessible(url, username, password, session=None):
     """is able to access jenkins with this password or not.
 
+    The probes share one keep-alive session by default,
+    so repeated probes reuse the connections.
+
     Args:
         url: jenkins url.
         username: username to login jenkins.
         password: password or API token of username.
+        session: requests.Session for the probe, None to use the shared one.
 
     Returns:
         bool.
@@ -192,7 +197,9 @@ def is_accessible(url, username, password):
         url = "http://%s" % url
 
     url = Jenkins.python_api_url(url)
-    requester = Jenkins.Requester(username, password)
+    if session is None:
+        session = _requester.get_shared_session()
+    requester = Jenkins.Requester(username, password, session=session)
     try:
         response = requester.get(url)
         if response.status_code in (401, 403):
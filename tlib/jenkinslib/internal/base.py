@@ -10,6 +10,7 @@ This module provides Jenkins object.
 
 import ast
 import logging
+import functools
 import pprint
 
 import tlib
@@ -112,8 +113,9 @@ class JenkinsBase(object):
             raise exception.Error('Cannot parse %s' % response.content)
 
     @classmethod
+    @functools.lru_cache(maxsize=128)
     def python_api_url(cls, url):
-        """generate python api of url."""
+        """generate python api of url, memoized per class and url."""
         if url.endswith(cls.JENKINS_API):
             return url
         else:
@@ -9,6 +9,7 @@ This module provides Jenkins object.
 """
 
 import os
+import functools
 
 import tlib
 import tlib.jenkinslib.internal
@@ -157,6 +158,8 @@ class Jenkins(base.JenkinsBase):
         """
         _url_to_jenkins[url.rstrip("/")] = cls
         _name_to_jenkins[cls.__name__] = cls
+        # the cached lookups may be stale now
+        Jenkins.get_jenkins_by_url.cache_clear()
 
     @staticmethod
     def get_jenkins_by_name(name):
@@ -171,8 +174,9 @@ class Jenkins(base.JenkinsBase):
         return _name_to_jenkins.get(name, Jenkins)
 
     @staticmethod
+    @functools.lru_cache(maxsize=128)
     def get_jenkins_by_url(url):
-        """get special jenkins class by url.
+        """get special jenkins class by url, memoized until register_special_jenkins is called.
 
         Args:
             url: url of jenkins server.
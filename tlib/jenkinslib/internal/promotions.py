@@ -32,6 +32,21 @@ class Promotions(base.JenkinsBase):
         """get object of current jenkins."""
         return self.job.jenkins
 
+    def poll(self, tree=None):
+        """poll out api info, and rebuild the name index of promotions."""
+        data = super(Promotions, self).poll(tree=tree)
+        if not tree:
+            self._build_cache()
+        return data
+
+    def _build_cache(self):
+        """cache promotion names and urls of current data in parallel containers,
+        so lookups don't walk all rows."""
+        rows = self._data.get('processes', []) if self._data else []
+        self._names_list = [row['name'] for row in rows]
+        self._names_set = set(self._names_list)
+        self._url_by_name = dict(zip(self._names_list, [row['url'] for row in rows]))
+
     def _poll(self, tree=None):
         """poll out api info.
 
@@ -46,30 +61,29 @@ class Promotions(base.JenkinsBase):
 
     def __getitem__(self, promotion_name):
         """get promotion by name."""
-        for row in self._data.get('processes', []):
-            if row["name"] == promotion_name:
-                return self.get_jenkins_obj().Promotion(row['url'], promotion_name, self.job)
+        if promotion_name not in self._names_set:
+            raise exception.UnknownPromotion(promotion_name)
 
-        raise exception.UnknownPromotion(promotion_name)
+        return self.get_jenkins_obj().Promotion(
+            self._url_by_name[promotion_name], promotion_name, self.job)
 
     def __contains__(self, promotion_name):
         """promotion exists or not."""
-        return promotion_name in self.keys()
+        return promotion_name in self._names_set
 
     def __len__(self):
         """promotion num."""
-        return len(self.keys())
+        return len(self._names_list)
 
     def __iter__(self):
         """iterator for job names."""
-        return (row['name'] for row in self._data.get('processes', []))
+        return iter(self._names_list)
 
     def iterkeys(self):
         """get all promotion name."""
-        for row in self._data.get('processes', []):
-            yield row['name']
+        return iter(self._names_list)
 
     def keys(self):
         """get all promotion name."""
-        return list(self.iterkeys())
+        return list(self._names_list)
 
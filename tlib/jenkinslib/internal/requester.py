@@ -8,18 +8,54 @@
 This module provides some requester to access jenkins.
 """
 
+from http import cookiejar
+
 from tlib.thirdp import requests
 from tlib.jenkinslib.internal import exception
 
+# connection pool size of the shared session
+SHARED_POOL_SIZE = 32
+
+_shared_session = None
+
+
+def get_shared_session():
+    """get the keep-alive session shared in current process, create it on first call.
+
+    The session is shared whatever the credentials, so it never keeps cookies,
+    otherwise a jenkins session cookie of one user would be sent for others.
+
+    Returns:
+        requests.Session object.
+    """
+    global _shared_session
+    if _shared_session is None:
+        session = requests.Session()
+        # reject all cookies
+        session.cookies.set_policy(cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=SHARED_POOL_SIZE, pool_maxsize=SHARED_POOL_SIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _shared_session = session
+    return _shared_session
+
 
 class Requester(object):
     """A class which help you access jenkins."""
     VALID_STATUS_CODES = [200]
 
-    def __init__(self, username=None, password=None):
-        """initialize Requester object."""
+    def __init__(self, username=None, password=None, session=None):
+        """initialize Requester object.
+
+        Args:
+            username: username to login jenkins.
+            password: password or API token of username.
+            session: requests.Session to reuse connections, None to use a new connection per request.
+        """
         self.username = username
         self.password = password
+        self.session = session
 
     def get(self, url, params=None, headers=None, allow_redirects=True):
         """request url in GET method.
@@ -30,7 +66,7 @@ class Requester(object):
         requests_kwargs = self.__build_request(params=params, headers=headers,
                                                allow_redirects=allow_redirects)
         try:
-            return requests.get(url, **requests_kwargs)
+            return (self.session or requests).get(url, **requests_kwargs)
         except requests.RequestException as err:
             raise exception.RequestError(url, "GET", err=err)
 
@@ -44,7 +80,7 @@ class Requester(object):
                                                data=data, files=files,
                                                allow_redirects=allow_redirects)
         try:
-            return requests.post(url, **requests_kwargs)
+            return (self.session or requests).post(url, **requests_kwargs)
         except requests.RequestException as err:
             raise exception.RequestError(url, "POST", err=err)
 